@@ -0,0 +1,57 @@
+"""In-memory cache for translator results."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+class TTLLRUCache:
+    """Least-recently-used cache whose entries also expire after a fixed TTL.
+    
+    Expired entries are not returned by get, but stay around (until evicted
+    as least recently used) so get_stale can still hand them out, e.g. to
+    revalidate them with a conditional request.
+    """
+    
+    def __init__(self, max_keys: int = 10_000, ttl: float = 3600):
+        """Initialize the cache.
+        
+        Args:
+            max_keys: Maximum number of entries before the least recently
+                used one is evicted
+            ttl: Seconds an entry stays valid after it was set
+        """
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the value cached for ``key``, or ``default`` if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            return default
+        self._entries.move_to_end(key)
+        return value
+    
+    def get_stale(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the value cached for ``key`` even if expired, or ``default`` if absent."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        return entry[1]
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache ``value`` for ``key``, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
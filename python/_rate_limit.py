@@ -0,0 +1,153 @@
+"""Rate limiting state shared by the translators, per host."""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Optional
+import aiohttp
+
+class AsyncTokenBucket:
+    """Token bucket rate limiter that waits with ``asyncio.sleep``.
+    
+    Refilling and taking a token happen without an intervening ``await``,
+    so concurrent coroutines on the event loop cannot race each other and
+    no lock is needed.
+    """
+    
+    def __init__(self, capacity: int = 50, rate: float = 50.0, min_rate: float = 1.0):
+        """Initialize the token bucket.
+        
+        Args:
+            capacity: Maximum number of tokens (burst size)
+            rate: Tokens added per second, also the ceiling for increase_rate
+            min_rate: Floor for decrease_rate
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.tokens: float = capacity
+        self.last_refill: float = time.monotonic()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            now = time.monotonic()
+            # last_refill lies in the future while the bucket is paused
+            if now > self.last_refill:
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.last_refill) * self.rate
+                )
+                self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep(
+                (self.last_refill - now) + (1 - self.tokens) / self.rate
+            )
+    
+    def pause(self, delay: float) -> None:
+        """Empty the bucket and stop refilling it for ``delay`` seconds."""
+        self.tokens = 0
+        self.last_refill = max(self.last_refill, time.monotonic() + delay)
+    
+    def decrease_rate(self) -> None:
+        """Halve the refill rate after the server pushed back."""
+        self.rate = max(self.min_rate, self.rate * 0.5)
+    
+    def increase_rate(self) -> None:
+        """Grow the refill rate back towards its ceiling after a success."""
+        self.rate = min(self.rate * 1.1 + 0.1, self.max_rate)
+
+class AdaptiveRetryBucket:
+    """Retry budget that lets a degraded service fail fast.
+    
+    Every retry costs ``retry_cost`` tokens and every success earns back
+    ``success_credit``. Once the budget is drained, callers stop retrying
+    instead of piling more load onto the struggling endpoint.
+    """
+    
+    def __init__(self, capacity: int = 500, success_credit: float = 1.0, retry_cost: float = 5.0):
+        """Initialize the retry budget.
+        
+        Args:
+            capacity: Maximum number of tokens
+            success_credit: Tokens earned back per successful request
+            retry_cost: Tokens spent per retry
+        """
+        self.capacity = capacity
+        self.success_credit = success_credit
+        self.retry_cost = retry_cost
+        self.tokens: float = capacity
+    
+    def try_consume(self) -> bool:
+        """Spend the cost of one retry, returning False if the budget is empty."""
+        if self.tokens < self.retry_cost:
+            return False
+        self.tokens -= self.retry_cost
+        return True
+    
+    def credit(self) -> None:
+        """Earn back part of the budget after a successful request."""
+        self.tokens = min(self.capacity, self.tokens + self.success_credit)
+
+class RateLimitState:
+    """Rate limiting state for one host, shared by every translator using it.
+    
+    Holds the token bucket and retry budget for the host along with the
+    last rate limit headers it sent. As the remaining allowance reported
+    by the server shrinks, the bucket's rate is capped proportionally so
+    clients slow down before running out rather than after a 429.
+    """
+    
+    def __init__(self, max_expected: int = 50):
+        """Initialize the rate limit state.
+        
+        Args:
+            max_expected: X-Rate-Limit-Remaining value that corresponds to
+                an untouched allowance
+        """
+        self.max_expected = max_expected
+        self.bucket = AsyncTokenBucket(capacity=50, rate=50.0)
+        self.retry_bucket = AdaptiveRetryBucket(
+            capacity=500, success_credit=1.0, retry_cost=5.0
+        )
+        self.remaining: Optional[int] = None
+        # Kept as a raw timestamp; only formatted if a RateLimitError is raised
+        self.reset: Optional[int] = None
+    
+    def update(self, response: aiohttp.ClientResponse) -> None:
+        """Update rate limit information from response headers."""
+        remaining = response.headers.get('X-Rate-Limit-Remaining')
+        reset = response.headers.get('X-Rate-Limit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            self.remaining = int(remaining)
+            self.reset = int(reset)
+        except ValueError:
+            self.remaining = None
+            self.reset = None
+            return
+        
+        bucket = self.bucket
+        soft_limit = bucket.max_rate * self.remaining / self.max_expected
+        bucket.rate = min(bucket.rate, max(bucket.min_rate, soft_limit))
+    
+    def format_reset(self) -> str:
+        """Describe when the rate limit resets, for error messages."""
+        if self.reset is None:
+            return "unknown"
+        try:
+            return datetime.fromtimestamp(self.reset).isoformat()
+        except (ValueError, OverflowError, OSError):
+            # e.g. a millisecond timestamp; report it as sent
+            return str(self.reset)
+
+_STATES: Dict[str, RateLimitState] = {}
+
+def for_host(host: str) -> RateLimitState:
+    """Return the rate limit state shared by all requests to ``host``."""
+    if host not in _STATES:
+        _STATES[host] = RateLimitState()
+    return _STATES[host]
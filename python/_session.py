@@ -0,0 +1,52 @@
+"""HTTP session handling shared by the translators."""
+
+from typing import Optional, TypeVar
+import aiohttp
+
+_T = TypeVar('_T', bound='ClientSessionMixin')
+
+def create_session() -> aiohttp.ClientSession:
+    """Create an HTTP session tuned for many back-to-back lookups.
+    
+    Keep-alive connections are reused across requests, DNS answers are
+    cached for five minutes and at most 20 connections are opened to
+    a single host.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        ),
+        timeout=aiohttp.ClientTimeout(total=30, connect=5)
+    )
+
+class ClientSessionMixin:
+    """HTTP session management for translators.
+    
+    Translators set ``http_client``, which may be None, and create a
+    session with create_session on first use if none was given, keeping
+    it in ``_owned_session``. Only that session is closed, even if the
+    caller has since replaced ``http_client``.
+    """
+    
+    http_client: Optional[aiohttp.ClientSession] = None
+    _owned_session: Optional[aiohttp.ClientSession] = None
+    
+    async def close(self) -> None:
+        """Close the HTTP session if this translator created it."""
+        session = self._owned_session
+        if session is None:
+            return
+        self._owned_session = None
+        if self.http_client is session:
+            self.http_client = None
+        await session.close()
+    
+    async def __aenter__(self: _T) -> _T:
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -1,16 +1,90 @@
 """CrossRef Translator for interacting with the CrossRef API."""
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 import aiohttp
-from datetime import datetime
+import msgspec
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import asyncio
-from ratelimit import limits, sleep_and_retry
+import random
+from urllib.parse import quote, urlsplit
+from ._cache import TTLLRUCache
+from ._session import ClientSessionMixin, create_session
+from . import _rate_limit
 
-class CrossRefTranslator:
+# Shared fallback for missing list fields when normalizing metadata
+_EMPTY: tuple = ()
+
+class CrossRefAuthor(msgspec.Struct):
+    """An author of a CrossRef work."""
+    
+    given: Optional[str] = None
+    family: Optional[str] = None
+
+class CrossRefDate(msgspec.Struct, rename={'date_parts': 'date-parts'}):
+    """A CrossRef date, e.g. ``{"date-parts": [[2020, 5, 17]]}``."""
+    
+    date_parts: Optional[List[List[Optional[int]]]] = None
+
+class CrossRefWork(msgspec.Struct, rename={
+    'container_title': 'container-title',
+    'published_print': 'published-print',
+    'published_online': 'published-online',
+}):
+    """The subset of a CrossRef work record that _normalize_metadata uses.
+    
+    Fields CrossRef omits, or sends as null, are None.
+    """
+    
+    DOI: Optional[str] = None
+    URL: Optional[str] = None
+    title: Optional[List[str]] = None
+    author: Optional[List[CrossRefAuthor]] = None
+    container_title: Optional[List[str]] = None
+    ISSN: Optional[List[str]] = None
+    issue: Optional[str] = None
+    volume: Optional[str] = None
+    published_print: Optional[CrossRefDate] = None
+    published_online: Optional[CrossRefDate] = None
+    created: Optional[CrossRefDate] = None
+    publisher: Optional[str] = None
+    type: Optional[str] = None
+    language: Optional[str] = None
+
+class _WorkResponse(msgspec.Struct):
+    message: CrossRefWork
+
+class _WorkList(msgspec.Struct):
+    items: List[CrossRefWork] = []
+
+class _WorksResponse(msgspec.Struct):
+    message: _WorkList
+
+# Decoders for /works/{doi} and /works?filter=... responses. Non-strict
+# mode accepts numbers sent as strings, e.g. "2020" in date-parts.
+_WORK_DECODER = msgspec.json.Decoder(_WorkResponse, strict=False)
+_WORKS_DECODER = msgspec.json.Decoder(_WorksResponse, strict=False)
+
+class CrossRefTranslator(ClientSessionMixin):
     """Translator for interacting with the CrossRef API."""
     
     BASE_URL = "https://api.crossref.org/works"
     
+    # Number of DOIs per filter request; much larger batches run into
+    # HTTP 414 (URI Too Long)
+    BATCH_SIZE = 16
+    
+    # Fields needed by _normalize_metadata, requested via select= so batch
+    # responses stay small
+    SELECT_FIELDS = (
+        "DOI,title,author,container-title,ISSN,issue,volume,published-print,"
+        "published-online,created,publisher,type,language,URL"
+    )
+    
+    # (ETag, decoded work) pairs keyed by DOI, shared by all instances. Works
+    # are normalized on every hit so each caller gets its own metadata dict.
+    _default_cache = TTLLRUCache(max_keys=10_000, ttl=3600)
+    
     def __init__(
         self,
         http_client: Optional[aiohttp.ClientSession] = None,
@@ -22,16 +96,27 @@ class CrossRefTranslator:
         Args:
             http_client: Optional HTTP client for making requests
             mailto: Email address for polite pool access
-            max_retries: Maximum number of retries for failed requests
+            max_retries: Maximum number of attempts per request, at least 1
+            
+        Raises:
+            ValueError: If max_retries is less than 1
         """
+        if max_retries < 1:
+            raise ValueError("max_retries must be at least 1")
+        
         self.http_client = http_client
         self.mailto = mailto
         self.max_retries = max_retries
-        self._rate_limit_remaining = None
-        self._rate_limit_reset = None
+        self._headers = {
+            'User-Agent': f'Bibli/1.0 (mailto:{mailto or "support@bibli.com"})'
+        }
+        self._url_prefix = self.BASE_URL + '/'
+        self._rate_limit = _rate_limit.for_host(urlsplit(self.BASE_URL).hostname)
+        self._bucket = self._rate_limit.bucket
+        self._acquire = self._bucket.acquire
+        self._retry_bucket = self._rate_limit.retry_bucket
+        self._cache = self._default_cache
     
-    @sleep_and_retry
-    @limits(calls=50, period=1)  # 50 requests per second max
     async def query_doi(self, doi: str) -> Dict[str, Any]:
         """Query CrossRef for metadata about a DOI.
         
@@ -41,6 +126,28 @@ class CrossRefTranslator:
         Returns:
             Dict containing the metadata for the DOI
             
+        Raises:
+            ValueError: If the DOI is invalid
+            CrossRefAPIError: If the API request fails
+            RateLimitError: If we've exceeded the rate limit
+        """
+        metadata = await self.try_query_doi(doi)
+        if metadata is None:
+            raise DOINotFoundError(f"DOI not found: {doi}")
+        return metadata
+    
+    async def try_query_doi(self, doi: str) -> Optional[Dict[str, Any]]:
+        """Query CrossRef for metadata about a DOI that may not exist.
+        
+        Same as query_doi, but an unknown DOI yields None instead of raising
+        DOINotFoundError, which keeps batch lookups with many misses cheap.
+        
+        Args:
+            doi: The DOI to query
+            
+        Returns:
+            Dict containing the metadata for the DOI, or None if not found
+            
         Raises:
             ValueError: If the DOI is invalid
             CrossRefAPIError: If the API request fails
@@ -49,97 +156,271 @@ class CrossRefTranslator:
         if not doi:
             raise ValueError("DOI cannot be empty")
         
-        if not self.http_client:
-            self.http_client = aiohttp.ClientSession()
+        cached = self._cache.get(doi)
+        if cached is not None:
+            return self._normalize_metadata(cached[1])
         
-        headers = {
-            'User-Agent': f'Bibli/1.0 (mailto:{self.mailto or "support@bibli.com"})'
-        }
+        # An expired entry can still be revalidated with its ETag, turning an
+        # unchanged record into a bodiless 304
+        stale = self._cache.get_stale(doi)
+        headers = None
+        if stale is not None and stale[0]:
+            headers = {**self._headers, 'If-None-Match': stale[0]}
+        
+        response = await self._get(self._url_prefix + doi, headers)
+        
+        if response.status == 404:
+            return None
+        
+        if response.status == 304 and headers is not None:
+            etag = response.headers.get('ETag', stale[0])
+            work = stale[1]
+        else:
+            etag = response.headers.get('ETag')
+            work = _decode(_WORK_DECODER, await response.read()).message
+        self._cache.set(doi, (etag, work))
+        return self._normalize_metadata(work)
+    
+    async def query_dois(
+        self, dois: List[str], concurrency: int = 10
+    ) -> Dict[str, Union[Dict[str, Any], BaseException]]:
+        """Query CrossRef for metadata about several DOIs at once.
+        
+        DOIs are looked up in chunks of ``BATCH_SIZE`` through the
+        ``/works?filter=doi:...`` endpoint, so N DOIs cost roughly
+        N / BATCH_SIZE requests instead of N.
+        
+        Args:
+            dois: The DOIs to query
+            concurrency: Maximum number of concurrent requests
+            
+        Returns:
+            Dict mapping each DOI that was found to its metadata, and each
+            DOI whose chunk request failed to the exception raised for it.
+            DOIs unknown to CrossRef are omitted.
+            
+        Raises:
+            ValueError: If any DOI is empty
+        """
+        if not all(dois):
+            raise ValueError("DOI cannot be empty")
         
-        url = f"{self.BASE_URL}/{doi}"
+        results: Dict[str, Union[Dict[str, Any], BaseException]] = {}
+        # CrossRef matches DOIs case-insensitively and returns its own casing,
+        # so look each DOI up once and hand the result to every spelling
+        spellings: Dict[str, List[str]] = {}
+        for doi in dict.fromkeys(dois):
+            cached = self._cache.get(doi)
+            if cached is not None:
+                results[doi] = self._normalize_metadata(cached[1])
+            else:
+                spellings.setdefault(doi.lower(), []).append(doi)
+        
+        missing = list(spellings)
+        chunks = [
+            missing[i:i + self.BATCH_SIZE]
+            for i in range(0, len(missing), self.BATCH_SIZE)
+        ]
+        sem = asyncio.BoundedSemaphore(concurrency)
+        
+        async def one(chunk: List[str]) -> Dict[str, CrossRefWork]:
+            async with sem:
+                return await self._query_chunk(chunk)
+        
+        # A failed chunk must not discard the results of the others
+        chunk_results = await asyncio.gather(*map(one, chunks), return_exceptions=True)
+        for chunk, found in zip(chunks, chunk_results):
+            if isinstance(found, BaseException):
+                for key in chunk:
+                    for doi in spellings[key]:
+                        results[doi] = found
+                continue
+            for key, work in found.items():
+                for doi in spellings[key]:
+                    results[doi] = self._normalize_metadata(work)
+                    # Filter responses carry no per-work ETag
+                    self._cache.set(doi, (None, work))
+        return results
+    
+    async def query_many(
+        self, dois: List[str], concurrency: int = 10
+    ) -> List[Union[Dict[str, Any], None, BaseException]]:
+        """Query CrossRef for several DOIs with at most ``concurrency`` requests in flight.
+        
+        Prefer query_dois, which needs far fewer requests; use this when
+        each DOI must go through query_doi, e.g. to get its full record.
+        
+        Args:
+            dois: The DOIs to query
+            concurrency: Maximum number of concurrent requests
+            
+        Returns:
+            List with, in the order of ``dois``, the metadata for each DOI,
+            None if it was not found, or the exception raised for it
+        """
+        sem = asyncio.BoundedSemaphore(concurrency)
+        
+        async def one(doi: str) -> Optional[Dict[str, Any]]:
+            async with sem:
+                return await self.try_query_doi(doi)
+        
+        return await asyncio.gather(*map(one, dois), return_exceptions=True)
+    
+    async def _query_chunk(self, dois: List[str]) -> Dict[str, CrossRefWork]:
+        """Look up a single chunk of lowercased DOIs with one filter request.
+        
+        Returns:
+            Dict mapping each lowercased DOI that was found to its work record
+        """
+        filter_param = quote(",".join(f"doi:{doi}" for doi in dois), safe=",:/")
+        url = (
+            f"{self.BASE_URL}?filter={filter_param}"
+            f"&rows={len(dois)}&select={self.SELECT_FIELDS}"
+        )
+        
+        response = await self._get(url)
+        
+        if response.status != 200:
+            raise CrossRefAPIError(f"CrossRef API error: {response.status}")
+        
+        works = _decode(_WORKS_DECODER, await response.read()).message.items
+        return {work.DOI.lower(): work for work in works if work.DOI}
+    
+    async def _get(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> aiohttp.ClientResponse:
+        """Perform a GET request against CrossRef, retrying network errors.
+        
+        Args:
+            url: The URL to request
+            headers: Headers to send instead of the default ones
+            
+        Returns:
+            The response, whose status is either 200, 304 or 404
+            
+        Raises:
+            CrossRefAPIError: If the API request fails
+            RateLimitError: If we've exceeded the rate limit
+        """
+        if not self.http_client:
+            self.http_client = self._owned_session = create_session()
+        if headers is None:
+            headers = self._headers
         
         for attempt in range(self.max_retries):
+            if attempt and not self._retry_bucket.try_consume():
+                raise CrossRefAPIError(
+                    "Retry budget exhausted, failing fast: CrossRef appears degraded"
+                )
+            await self._acquire()
             try:
                 response = await self.http_client.get(url, headers=headers)
-                
-                # Handle rate limiting
-                self._update_rate_limits(response)
-                
-                if response.status == 429:
-                    reset_time = self._rate_limit_reset or "unknown"
-                    raise RateLimitError(f"Rate limit exceeded. Reset at {reset_time}")
-                
-                if response.status == 404:
-                    raise DOINotFoundError(f"DOI not found: {doi}")
-                
-                if response.status != 200:
-                    raise CrossRefAPIError(
-                        f"CrossRef API error: {response.status}"
-                    )
-                
-                data = await response.json()
-                return self._normalize_metadata(data['message'])
-                
             except aiohttp.ClientError as e:
                 if attempt == self.max_retries - 1:
                     raise CrossRefAPIError(f"Network error: {str(e)}")
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                await asyncio.sleep(_backoff_delay(attempt))
+                continue
+            
+            # Handle rate limiting
+            self._rate_limit.update(response)
+            
+            if response.status == 429 or response.status >= 500:
+                # Server-side pushback drains the retry budget too
+                self._retry_bucket.try_consume()
+            
+            if response.status in (429, 503):
+                if response.status == 429:
+                    self._bucket.decrease_rate()
+                if attempt == self.max_retries - 1:
+                    if response.status == 429:
+                        raise RateLimitError(
+                            f"Rate limit exceeded. Reset at {self._rate_limit.format_reset()}"
+                        )
+                    raise CrossRefAPIError(f"CrossRef API error: {response.status}")
+                # Pausing the shared bucket holds back every concurrent
+                # request, and the next acquire() waits out the delay
+                self._bucket.pause(_retry_after_delay(response, attempt))
+                continue
+            
+            if response.status not in (200, 304, 404):
+                raise CrossRefAPIError(
+                    f"CrossRef API error: {response.status}"
+                )
+            
+            self._retry_bucket.credit()
+            self._bucket.increase_rate()
+            return response
     
-    def _normalize_metadata(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _normalize_metadata(self, work: CrossRefWork) -> Dict[str, Any]:
         """Normalize CrossRef metadata to our standard format.
         
         Args:
-            data: Raw metadata from CrossRef
+            work: Decoded work record from CrossRef
             
         Returns:
             Dict with normalized metadata
         """
-        # Helper function to safely get first item from a list
-        def get_first(lst, default=None):
-            return lst[0] if lst and len(lst) > 0 else default
+        # Extract publication date, trying different fields
+        year = None
+        for date in (work.published_print, work.published_online, work.created):
+            if date is not None:
+                date_parts = date.date_parts
+                if date_parts and date_parts[0] and date_parts[0][0]:
+                    year = date_parts[0][0]
+                    break
         
         metadata = {
-            'title': get_first(data.get('title', [])),
-            'authors': [],
-            'doi': data.get('DOI'),
-            'url': data.get('URL'),
-            'journal': get_first(data.get('container-title', [])),
-            'issn': get_first(data.get('ISSN', [])),
-            'issue': data.get('issue'),
-            'volume': data.get('volume'),
-            'year': None,
-            'publisher': data.get('publisher'),
-            'type': data.get('type'),
-            'language': data.get('language')
+            'title': work.title[0] if work.title else None,
+            'authors': [
+                {'firstName': author.given, 'lastName': author.family}
+                for author in work.author or _EMPTY
+            ],
+            'doi': work.DOI,
+            'url': work.URL,
+            'journal': work.container_title[0] if work.container_title else None,
+            'issn': work.ISSN[0] if work.ISSN else None,
+            'issue': work.issue,
+            'volume': work.volume,
+            'year': year,
+            'publisher': work.publisher,
+            'type': work.type,
+            'language': work.language
         }
         
-        # Extract authors
-        for author in data.get('author', []):
-            metadata['authors'].append({
-                'firstName': author.get('given'),
-                'lastName': author.get('family')
-            })
-        
-        # Extract publication date, trying different fields
-        date_fields = ['published-print', 'published-online', 'created']
-        for field in date_fields:
-            if field in data:
-                date_parts = data[field].get('date-parts', [[None]])[0]
-                if date_parts and date_parts[0]:
-                    metadata['year'] = date_parts[0]
-                    break
-        
         return metadata
+
+def _decode(decoder: msgspec.json.Decoder, body: bytes) -> Any:
+    """Decode a CrossRef response body into its typed structure."""
+    try:
+        return decoder.decode(body)
+    except msgspec.DecodeError as e:
+        raise CrossRefAPIError(f"Invalid CrossRef response: {str(e)}")
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given retry attempt."""
+    return 2 ** attempt + random.uniform(0, 1)
+
+def _retry_after_delay(response: aiohttp.ClientResponse, attempt: int) -> float:
+    """Seconds to wait before retrying, honoring a Retry-After header.
     
-    def _update_rate_limits(self, response: aiohttp.ClientResponse) -> None:
-        """Update rate limit information from response headers."""
+    Retry-After may hold either a number of seconds or an HTTP date; if it
+    is missing or malformed, fall back to exponential backoff.
+    """
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0, int(retry_after))
+        except ValueError:
+            pass
         try:
-            self._rate_limit_remaining = int(response.headers.get('X-Rate-Limit-Remaining', 0))
-            reset_timestamp = int(response.headers.get('X-Rate-Limit-Reset', 0))
-            self._rate_limit_reset = datetime.fromtimestamp(reset_timestamp)
-        except (ValueError, TypeError):
-            self._rate_limit_remaining = None
-            self._rate_limit_reset = None
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            pass
+        else:
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    return _backoff_delay(attempt)
 
 class CrossRefAPIError(Exception):
     """Raised when the CrossRef API returns an error."""
@@ -1,17 +1,25 @@
 """DOI Translator for resolving and validating DOIs."""
 
+import asyncio
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union
 import aiohttp
-from datetime import datetime
+import orjson
 from ..services.proxy_service import ProxyService
+from ._cache import TTLLRUCache
+from ._session import ClientSessionMixin, create_session
+from . import _rate_limit
 
-class DOITranslator:
+class DOITranslator(ClientSessionMixin):
     """Translator for handling DOI resolution and validation."""
     
     # DOI regex pattern based on CrossRef's guidelines
     DOI_PATTERN = re.compile(r'^10\.\d{4,}/[-._;()/:\w]+$')
     
+    # (ETag, CSL JSON body) pairs keyed by DOI, shared by all instances. The
+    # raw body is cached so every caller decodes its own copy of the metadata.
+    _default_cache = TTLLRUCache(max_keys=10_000, ttl=3600)
+    
     def __init__(self, http_client: Optional[aiohttp.ClientSession] = None, proxy_service: Optional[ProxyService] = None):
         """Initialize the DOI translator.
         
@@ -21,8 +29,15 @@ class DOITranslator:
         """
         self.http_client = http_client
         self.proxy_service = proxy_service
-        self._rate_limit_remaining = None
-        self._rate_limit_reset = None
+        self._headers = {
+            'Accept': 'application/vnd.citationstyles.csl+json',
+            'User-Agent': 'Bibli/1.0 (mailto:support@bibli.com)'
+        }
+        self._url_prefix = 'https://doi.org/'
+        self._rate_limit = _rate_limit.for_host('doi.org')
+        self._bucket = self._rate_limit.bucket
+        self._acquire = self._bucket.acquire
+        self._cache = self._default_cache
     
     @classmethod
     def with_institutional_access(cls, http_client: Optional[aiohttp.ClientSession] = None) -> 'DOITranslator':
@@ -33,7 +48,7 @@ class DOITranslator:
         """Validate if a string is a properly formatted DOI."""
         if not doi:
             return False
-        return bool(self.DOI_PATTERN.match(doi))
+        return self.DOI_PATTERN.match(doi) is not None
     
     async def resolve_doi(self, doi: str) -> Dict[str, Any]:
         """Resolve a DOI to its metadata using content negotiation.
@@ -44,6 +59,29 @@ class DOITranslator:
         Returns:
             Dict containing the metadata for the DOI
             
+        Raises:
+            ValueError: If the DOI is invalid
+            DOIResolutionError: If the DOI cannot be resolved
+            RateLimitError: If we've exceeded the rate limit
+        """
+        metadata = await self.try_resolve_doi(doi)
+        if metadata is None:
+            raise DOINotFoundError(f"DOI not found: {doi}")
+        return metadata
+    
+    async def try_resolve_doi(self, doi: str) -> Optional[Dict[str, Any]]:
+        """Resolve a DOI that may not exist to its metadata.
+        
+        Same as resolve_doi, but an unknown DOI yields None instead of
+        raising DOINotFoundError, which keeps batch lookups with many misses
+        cheap.
+        
+        Args:
+            doi: The DOI to resolve
+            
+        Returns:
+            Dict containing the metadata for the DOI, or None if not found
+            
         Raises:
             ValueError: If the DOI is invalid
             DOIResolutionError: If the DOI cannot be resolved
@@ -52,61 +90,117 @@ class DOITranslator:
         if not self.validate_doi(doi):
             raise ValueError(f"Invalid DOI format: {doi}")
         
-        if not self.http_client:
-            self.http_client = aiohttp.ClientSession()
+        cached = self._cache.get(doi)
+        if cached is None:
+            cached = await self._fetch_metadata(doi, self._cache.get_stale(doi))
+            if cached is None:
+                return None
+            # Decoded before caching so a body that isn't CSL JSON never is
+            metadata = _decode(doi, cached[1])
+            self._cache.set(doi, cached)
+        else:
+            metadata = _decode(doi, cached[1])
         
-        headers = {
-            'Accept': 'application/vnd.citationstyles.csl+json',
-            'User-Agent': 'Bibli/1.0 (mailto:support@bibli.com)'
-        }
+        # Add proxied URLs if available
+        if self.proxy_service:
+            if 'URL' in metadata:
+                metadata['proxied_url'] = self.proxy_service.transform_url(metadata['URL'])
+            if 'link' in metadata:
+                metadata['proxied_link'] = self.proxy_service.transform_url(metadata['link'])
         
-        url = f'https://doi.org/{doi}'
+        return metadata
+    
+    async def _fetch_metadata(
+        self, doi: str, stale: Optional[Tuple[Optional[str], bytes]] = None
+    ) -> Optional[Tuple[Optional[str], bytes]]:
+        """Fetch the CSL JSON for a DOI from doi.org.
+        
+        Args:
+            doi: The DOI to resolve
+            stale: Expired (ETag, body) cache entry; if it has an ETag, the
+                request is made conditional and a 304 reuses its body
+            
+        Returns:
+            (ETag, body) pair, or None if the DOI was not found
+        """
+        if not self.http_client:
+            self.http_client = self._owned_session = create_session()
+        
+        url = self._url_prefix + doi
         
         # Transform URL through proxy if available
         if self.proxy_service:
             url = self.proxy_service.transform_url(url)
         
+        headers = self._headers
+        if stale is not None and stale[0]:
+            headers = {**self._headers, 'If-None-Match': stale[0]}
+        
+        await self._acquire()
         try:
             response = await self.http_client.get(url, headers=headers)
             
             # Handle rate limiting
-            self._update_rate_limits(response)
+            self._rate_limit.update(response)
             
             if response.status == 429:
-                reset_time = self._rate_limit_reset or "unknown"
-                raise RateLimitError(f"Rate limit exceeded. Reset at {reset_time}")
+                self._bucket.decrease_rate()
+                raise RateLimitError(
+                    f"Rate limit exceeded. Reset at {self._rate_limit.format_reset()}"
+                )
+            
+            if response.status in (200, 304, 404):
+                # Lets the rate recover after a soft limit or a 429
+                self._bucket.increase_rate()
             
             if response.status == 404:
-                raise DOINotFoundError(f"DOI not found: {doi}")
+                return None
+            
+            if response.status == 304 and headers is not self._headers:
+                return response.headers.get('ETag', stale[0]), stale[1]
             
             if response.status != 200:
                 raise DOIResolutionError(
                     f"Failed to resolve DOI: {doi}. Status: {response.status}"
                 )
             
-            metadata = await response.json()
-            
-            # Add proxied URLs if available
-            if self.proxy_service:
-                if 'URL' in metadata:
-                    metadata['proxied_url'] = self.proxy_service.transform_url(metadata['URL'])
-                if 'link' in metadata:
-                    metadata['proxied_link'] = self.proxy_service.transform_url(metadata['link'])
-            
-            return metadata
+            return response.headers.get('ETag'), await response.read()
                 
         except aiohttp.ClientError as e:
             raise DOIResolutionError(f"Network error resolving DOI: {str(e)}")
     
-    def _update_rate_limits(self, response: aiohttp.ClientResponse) -> None:
-        """Update rate limit information from response headers."""
-        try:
-            self._rate_limit_remaining = int(response.headers.get('X-Rate-Limit-Remaining', 0))
-            reset_timestamp = int(response.headers.get('X-Rate-Limit-Reset', 0))
-            self._rate_limit_reset = datetime.fromtimestamp(reset_timestamp)
-        except (ValueError, TypeError):
-            self._rate_limit_remaining = None
-            self._rate_limit_reset = None
+    async def query_many(
+        self, dois: List[str], concurrency: int = 5
+    ) -> List[Union[Dict[str, Any], None, BaseException]]:
+        """Resolve several DOIs with at most ``concurrency`` requests in flight.
+        
+        Args:
+            dois: The DOIs to resolve
+            concurrency: Maximum number of concurrent requests
+            
+        Returns:
+            List with, in the order of ``dois``, the metadata for each DOI,
+            None if it was not found, or the exception raised for it
+        """
+        sem = asyncio.BoundedSemaphore(concurrency)
+        
+        async def one(doi: str) -> Optional[Dict[str, Any]]:
+            async with sem:
+                return await self.try_resolve_doi(doi)
+        
+        return await asyncio.gather(*map(one, dois), return_exceptions=True)
+
+def _decode(doi: str, body: bytes) -> Dict[str, Any]:
+    """Decode a CSL JSON response body.
+    
+    doi.org answers with the HTML landing page instead of CSL JSON when the
+    DOI's registration agency doesn't support content negotiation, so the
+    body is only trusted once it parses.
+    """
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise DOIResolutionError(f"No CSL JSON returned for DOI: {doi}: {str(e)}")
 
 class DOIResolutionError(Exception):
     """Raised when a DOI cannot be resolved."""